@@ -1,70 +1,160 @@
 import requests
-import json
-from datetime import date, datetime
-import xml.etree.ElementTree as ET # Import for XML parsing
-import sys # Import sys for stderr printing
-from bs4 import BeautifulSoup # Import BeautifulSoup for HTML parsing
+from requests.adapters import HTTPAdapter # Import for connection pooling
+from urllib3.util.retry import Retry # Import for retrying failed connections
+from datetime import date, datetime, timedelta
+import sys # Import sys for stderr output (each message is one write() call, so lines from different threads never run together)
+import io # Import io to stream XML parsing from the downloaded bytes
+from lxml import etree, html as lxml_html # Import lxml for XML and HTML parsing
 import os # Import os module to access environment variables
 import random # Import for selecting random items
+import itertools # Import for chaining news results together without copying them
+import sqlite3 # Import for the article preview cache
+import threading # Import for sharing the preview cache between threads
+import time # Import for timestamping cached previews
+import logging # Import for debug logging
+from concurrent.futures import ThreadPoolExecutor # Import for fetching feeds and APIs concurrently
+from collections.abc import Iterable # Import for type hints
+from dataclasses import dataclass # Import for the NewsItem record
+
+try:
+    import requests_cache # Optional: enables the on-disk HTTP cache (see ENABLE_HTTP_CACHE)
+except ImportError:
+    requests_cache = None
+
+try:
+    from orjson import loads as json_loads # Optional: faster JSON parsing of API responses
+except ImportError:
+    from json import loads as json_loads
 
 # --- Configuration ---
-# These settings will first try to read from environment variables.
-# If environment variables are not set, these default values will be used.
-
-# General Debugging
-# Set to 'True' to enable debug logging. Outputs detailed information to standard output.
-# Environment variable: DEBUG (expects 'True' or 'False')
-DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
-
-# News Output Options
-# Number of news items to output.
-# Environment variable: NUM_NEWS_ITEMS (expects an integer)
-NUM_NEWS_ITEMS = int(os.getenv('NUM_NEWS_ITEMS', '10')) # Default to 10 news items
-
-# News Article Preview Options
-# Set to 'True' to fetch and include the story preview. Set to 'False' to only show "Read more" links.
-# Environment variable: SHOW_FULL_STORY_PREVIEW (expects 'True' or 'False')
-SHOW_FULL_STORY_PREVIEW = os.getenv('SHOW_FULL_STORY_PREVIEW', 'False').lower() == 'true'
-
-# Number of paragraphs to include in the story preview if SHOW_FULL_STORY_PREVIEW is True.
-# Environment variable: SHOW_FULL_STORY_PARAGRAPHS (expects an integer)
-SHOW_FULL_STORY_PARAGRAPHS = int(os.getenv('SHOW_FULL_STORY_PARAGRAPHS', '2'))
-
-# Set to 'True' to display the "[Continue reading at link]" text after the preview.
-# Set to 'False' to omit this link.
-# Environment variable: SHOW_CONTINUE_LINK (expects 'True' or 'False')
-SHOW_CONTINUE_LINK = os.getenv('SHOW_CONTINUE_LINK', 'True').lower() == 'true'
-
-# Conversational Mode for TTS
-# Set to 'True' for more conversational output, suitable for Text-to-Speech.
-# Environment variable: CONVERSATIONAL_MODE (expects 'True' or 'False')
-CONVERSATIONAL_MODE = os.getenv('CONVERSATIONAL_MODE', 'False').lower() == 'true'
-
+# These settings are read from environment variables once, when the briefing starts (see Config.from_env).
+# If environment variables are not set, the default values given there will be used.
 
 # API Keys (prioritize environment variables)
 # IMPORTANT: Replace 'YOUR_OPENWEATHERMAP_API_KEY' with your actual OpenWeatherMap API key.
 # Environment variable: OPENWEATHERMAP_API_KEY
 OPENWEATHERMAP_API_KEY_DEFAULT = 'YOUR_OPENWEATHERMAP_API_KEY'
 
-# Feature Toggles
-# Set to 'True' to include a random fact in the briefing.
-# Environment variable: ENABLE_RANDOM_FACT (expects 'True' or 'False')
-ENABLE_RANDOM_FACT = os.getenv('ENABLE_RANDOM_FACT', 'False').lower() == 'true'
-
-# Set to 'True' to include a random joke in the briefing.
-# Environment variable: ENABLE_RANDOM_JOKE (expects 'True' or 'False')
-ENABLE_RANDOM_JOKE = os.getenv('ENABLE_RANDOM_JOKE', 'False').lower() == 'true'
 
-# Set to 'True' to include an "On this day in history" event in the briefing.
-# Environment variable: ENABLE_ONTHISDAY (expects 'True' or 'False')
-ENABLE_ONTHISDAY = os.getenv('ENABLE_ONTHISDAY', 'False').lower() == 'true'
-
-# Custom Location via Environment Variables
-# If all three of these environment variables are set, they will override command-line location.
-# Environment variables: LOCATION_NAME, LOCATION_LATITUDE, LOCATION_LONGITUDE
-CUSTOM_LOCATION_NAME = os.getenv('LOCATION_NAME')
-CUSTOM_LOCATION_LATITUDE = os.getenv('LOCATION_LATITUDE')
-CUSTOM_LOCATION_LONGITUDE = os.getenv('LOCATION_LONGITUDE')
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Settings for a briefing run, parsed once from environment variables by from_env()."""
+
+    # General Debugging
+    # Set to 'True' to enable debug logging. Outputs detailed information to standard output.
+    # Environment variable: DEBUG (expects 'True' or 'False')
+    debug: bool
+
+    # News Output Options
+    # Number of news items to output.
+    # Environment variable: NUM_NEWS_ITEMS (expects an integer)
+    num_news_items: int
+
+    # News Article Preview Options
+    # Set to 'True' to fetch and include the story preview. Set to 'False' to only show "Read more" links.
+    # Environment variable: SHOW_FULL_STORY_PREVIEW (expects 'True' or 'False')
+    show_full_story_preview: bool
+
+    # Number of paragraphs to include in the story preview if show_full_story_preview is True.
+    # Environment variable: SHOW_FULL_STORY_PARAGRAPHS (expects an integer)
+    show_full_story_paragraphs: int
+
+    # Set to 'True' to display the "[Continue reading at link]" text after the preview.
+    # Set to 'False' to omit this link.
+    # Environment variable: SHOW_CONTINUE_LINK (expects 'True' or 'False')
+    show_continue_link: bool
+
+    # Conversational Mode for TTS
+    # Set to 'True' for more conversational output, suitable for Text-to-Speech.
+    # Environment variable: CONVERSATIONAL_MODE (expects 'True' or 'False')
+    conversational_mode: bool
+
+    # HTTP Cache
+    # Set to 'True' to keep RSS feed, weather and 'On this day' responses in an on-disk cache,
+    # so running the briefing again shortly afterwards does not download them again.
+    # Requires the 'requests-cache' package; without it every run fetches everything.
+    # Off by default, as the cache is a file written on every run.
+    # Environment variable: ENABLE_HTTP_CACHE (expects 'True' or 'False')
+    enable_http_cache: bool
+
+    # Location of the HTTP cache (an SQLite database; '.sqlite' is appended to the name).
+    # Relative paths are relative to the current directory, which is /config when run from Home Assistant.
+    # Environment variable: HTTP_CACHE_FILE
+    http_cache_file: str
+
+    # Article Preview Cache
+    # Set to 'True' to keep extracted story previews in an on-disk SQLite database for 24 hours, so stories
+    # that appear again in a later briefing skip downloading and parsing the article page.
+    # Only used if show_full_story_preview is True. Off by default, as the cache is a file written on every run.
+    # Environment variable: ENABLE_PREVIEW_CACHE (expects 'True' or 'False')
+    enable_preview_cache: bool
+
+    # Location of the article preview cache database.
+    # Relative paths are relative to the current directory, which is /config when run from Home Assistant.
+    # Environment variable: PREVIEW_CACHE_FILE
+    preview_cache_file: str
+
+    # OpenWeatherMap API key, falling back to OPENWEATHERMAP_API_KEY_DEFAULT.
+    # Environment variable: OPENWEATHERMAP_API_KEY
+    openweathermap_api_key: str
+
+    # Feature Toggles
+    # Set to 'True' to include a random fact in the briefing.
+    # Environment variable: ENABLE_RANDOM_FACT (expects 'True' or 'False')
+    enable_random_fact: bool
+
+    # Set to 'True' to include a random joke in the briefing.
+    # Environment variable: ENABLE_RANDOM_JOKE (expects 'True' or 'False')
+    enable_random_joke: bool
+
+    # Set to 'True' to include an "On this day in history" event in the briefing.
+    # Environment variable: ENABLE_ONTHISDAY (expects 'True' or 'False')
+    enable_onthisday: bool
+
+    # Custom Location via Environment Variables
+    # If all three of these environment variables are set, they will override command-line location.
+    # Environment variables: LOCATION_NAME, LOCATION_LATITUDE, LOCATION_LONGITUDE
+    custom_location_name: str | None
+    custom_location_latitude: str | None
+    custom_location_longitude: str | None
+
+    @classmethod
+    def from_env(cls):
+        """
+        Reads every setting from its environment variable, using the defaults below for any that are not set.
+        """
+        def env_flag(name, default):
+            return os.getenv(name, default).lower() == 'true'
+
+        return cls(
+            debug=env_flag('DEBUG', 'False'),
+            num_news_items=int(os.getenv('NUM_NEWS_ITEMS', '10')), # Default to 10 news items
+            show_full_story_preview=env_flag('SHOW_FULL_STORY_PREVIEW', 'False'),
+            show_full_story_paragraphs=int(os.getenv('SHOW_FULL_STORY_PARAGRAPHS', '2')),
+            show_continue_link=env_flag('SHOW_CONTINUE_LINK', 'True'),
+            conversational_mode=env_flag('CONVERSATIONAL_MODE', 'False'),
+            enable_http_cache=env_flag('ENABLE_HTTP_CACHE', 'False'),
+            http_cache_file=os.getenv('HTTP_CACHE_FILE', 'briefing_cache'),
+            enable_preview_cache=env_flag('ENABLE_PREVIEW_CACHE', 'False'),
+            preview_cache_file=os.getenv('PREVIEW_CACHE_FILE', 'preview_cache.db'),
+            openweathermap_api_key=os.getenv('OPENWEATHERMAP_API_KEY', OPENWEATHERMAP_API_KEY_DEFAULT),
+            enable_random_fact=env_flag('ENABLE_RANDOM_FACT', 'False'),
+            enable_random_joke=env_flag('ENABLE_RANDOM_JOKE', 'False'),
+            enable_onthisday=env_flag('ENABLE_ONTHISDAY', 'False'),
+            custom_location_name=os.getenv('LOCATION_NAME'),
+            custom_location_latitude=os.getenv('LOCATION_LATITUDE'),
+            custom_location_longitude=os.getenv('LOCATION_LONGITUDE'),
+        )
+
+
+# Debug logger, writing 'DEBUG: ...' lines to standard output once the main block enables it from Config.debug.
+# Messages are only formatted if they will actually be written, so disabled debug logging costs almost nothing.
+log = logging.getLogger('daily_briefing')
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+log.addHandler(_log_handler)
+log.setLevel(logging.WARNING)
+log.propagate = False
 
 
 # RSS feed URLs (direct RSS feed URLs)
@@ -88,177 +178,426 @@ LOCATIONS = {
     'liverpool': {'lat': 53.4084, 'lon': -2.9916, 'name': 'Liverpool'}
 }
 
+# Thread pool shared by all feeds for fetching article previews in parallel.
+# Preview fetching is network-bound, so several pages can be downloaded at once.
+PREVIEW_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+# Maximum number of bytes downloaded from an article page when building a preview.
+# The opening paragraphs sit near the top of the page, so the rest (scripts, related links, ads) is skipped.
+ARTICLE_PREVIEW_MAX_BYTES = 64 * 1024
+
+# Maximum length of a paragraph taken from a page's structured data ('articleBody'), so one over-long
+# paragraph is never read out in full; longer paragraphs are cut at the last word that fits.
+STRUCTURED_DATA_PARAGRAPH_MAX_CHARS = 500
+
+# How long an extracted article preview is reused from the preview cache
+PREVIEW_CACHE_TTL = timedelta(hours=24)
+
+# Connection to the article preview cache, opened in the main block if enabled (None otherwise).
+# A single connection is shared by the preview threads, so every use must hold PREVIEW_CACHE_LOCK.
+PREVIEW_CACHE = None
+PREVIEW_CACHE_LOCK = threading.Lock()
+
+# XML namespace used by Atom feeds, and the tag of an Atom feed entry
+ATOM_NAMESPACES = {'atom': 'http://www.w3.org/2005/Atom'}
+ATOM_ENTRY_TAG = '{http://www.w3.org/2005/Atom}entry'
+
+# Potential main article content containers as (tag, class), ordered by commonality/specificity.
+# A class of None matches the tag regardless of its classes.
+CONTENT_CONTAINERS = [
+    ('div', 'sdc-article-body'),  # Common for BBC and some Sky
+    ('div', 'story-body__inner'), # Older BBC
+    ('div', 'article__content'),  # Often used by Sky News
+    ('div', 'article-body'),      # Generic but common
+    ('article', None), # HTML5 semantic tag for main article content
+    ('main', None),    # HTML5 semantic tag for main content of the <body>
+]
+
+# Single compiled XPath query returning every candidate container in one pass over the page.
+# Class checks match a whole class name, even when the element has several classes.
+FIND_CONTENT_CONTAINERS = etree.XPath("//*[{}]".format(" or ".join(
+    f"self::{tag} and contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')" if css_class else f"self::{tag}"
+    for tag, css_class in CONTENT_CONTAINERS
+)))
+
+# Compiled XPath query returning at most $limit substantial paragraphs under an element, in a single pass.
+# Paragraphs inside common non-article elements like headers, footers or navigation are skipped, as are
+# very short ones (e.g., image captions, single words); a heuristic of > 100 characters helps ensure
+# meaningful content. Doing this in libxml2 means Python only sees the paragraphs it will actually use.
+# descendant::p (rather than .//p) makes position() count across the whole element, not per parent, and
+# non-breaking spaces are treated as whitespace so the length matches the collapsed text in Python.
+FIND_ARTICLE_PARAGRAPHS = etree.XPath(
+    "descendant::p[not(ancestor::header or ancestor::footer or ancestor::nav)]"
+    "[string-length(normalize-space(translate(., '\u00a0', ' '))) > 100]"
+    "[position() <= $limit]"
+)
+
+# Compiled XPath query returning the contents of a page's JSON-LD structured data blocks as plain strings
+FIND_JSON_LD = etree.XPath("//script[@type='application/ld+json']/text()", smart_strings=False)
+
+# --- Data Types ---
+
+@dataclass(slots=True)
+class NewsItem:
+    """A single news story taken from an RSS feed."""
+    title: str
+    description: str
+    link: str
+    source: str
+    full_story_preview: str = "" # Left empty if no preview is fetched
+
+
 # --- Functions ---
 
-def get_article_preview(article_url, num_paragraphs=2):
+def create_session(cfg):
+    """
+    Creates the shared HTTP session, so connections (and their TLS handshakes) are reused across requests
+    to the same host, e.g. the BBC and Sky feeds and their article pages.
+    When the HTTP cache is enabled, responses are kept for a fixed time per URL. Article pages, random facts
+    and jokes are not cached, so previews still only download the start of a page and the extras stay random.
+    """
+    if cfg.enable_http_cache and requests_cache is not None:
+        session = requests_cache.CachedSession(
+            cfg.http_cache_file,
+            backend='sqlite',
+            expire_after=requests_cache.DO_NOT_CACHE,
+            urls_expire_after={
+                **{feed['url']: timedelta(minutes=15) for feed in RSS_FEEDS},
+                'api.openweathermap.org': timedelta(hours=1),
+                'byabbe.se/on-this-day': timedelta(days=1),
+            },
+            allowable_methods=['GET'],
+            ignored_parameters=['appid'], # Keep the OpenWeatherMap API key out of the cache file
+        )
+    else:
+        session = requests.Session()
+
+    # The connection pool is sized to cover the feed and preview threads fetching at the same time.
+    http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2))
+    session.mount('http://', http_adapter)
+    session.mount('https://', http_adapter)
+    return session
+
+
+def open_preview_cache(cache_file):
+    """
+    Opens (creating if needed) the SQLite database of extracted article previews and removes expired entries.
+    Returns the connection, or None if the database could not be opened.
+    The connection is in autocommit mode, so no write transaction is held open while the briefing runs
+    and other briefings running at the same time can still use the cache.
+    """
+    connection = None
+    try:
+        connection = sqlite3.connect(cache_file, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        # Previews are keyed by paragraph count too, so changing SHOW_FULL_STORY_PARAGRAPHS takes effect at once
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS previews ("
+            "url TEXT NOT NULL, num_paragraphs INTEGER NOT NULL, fetched_at INTEGER NOT NULL, text TEXT NOT NULL, "
+            "PRIMARY KEY (url, num_paragraphs))"
+        )
+        connection.execute("DELETE FROM previews WHERE fetched_at <= ?", (int(time.time() - PREVIEW_CACHE_TTL.total_seconds()),))
+        return connection
+    except sqlite3.Error as e:
+        sys.stderr.write(f"Warning: Could not open article preview cache {cache_file}: {e}\n")
+        if connection is not None:
+            connection.close()
+        return None
+
+
+def close_preview_cache():
+    """
+    Closes the article preview cache, if it is open.
+    """
+    if PREVIEW_CACHE is None:
+        return
+    try:
+        with PREVIEW_CACHE_LOCK:
+            PREVIEW_CACHE.close()
+    except sqlite3.Error as e:
+        sys.stderr.write(f"Warning: Could not close article preview cache: {e}\n")
+
+
+def get_cached_preview(article_url, num_paragraphs):
+    """
+    Returns the cached preview for an article URL if there is one younger than PREVIEW_CACHE_TTL, otherwise None.
+    """
+    if PREVIEW_CACHE is None:
+        return None
+    try:
+        with PREVIEW_CACHE_LOCK:
+            row = PREVIEW_CACHE.execute(
+                "SELECT text FROM previews WHERE url = ? AND num_paragraphs = ? AND fetched_at > ?",
+                (article_url, num_paragraphs, int(time.time() - PREVIEW_CACHE_TTL.total_seconds()))
+            ).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error as e:
+        sys.stderr.write(f"Warning: Could not read article preview cache: {e}\n")
+        return None
+
+
+def cache_preview(article_url, num_paragraphs, text):
     """
-    Fetches the content of an article URL and extracts the first N substantial paragraphs.
+    Stores an extracted preview in the article preview cache.
+    """
+    if PREVIEW_CACHE is None:
+        return
+    try:
+        with PREVIEW_CACHE_LOCK:
+            PREVIEW_CACHE.execute(
+                "INSERT OR REPLACE INTO previews (url, num_paragraphs, fetched_at, text) VALUES (?, ?, ?, ?)",
+                (article_url, num_paragraphs, int(time.time()), text)
+            )
+    except sqlite3.Error as e:
+        sys.stderr.write(f"Warning: Could not write article preview cache: {e}\n")
+
+
+def parse_html(content, encoding=None):
+    """
+    Parses the raw bytes of a (possibly cut off) HTML page with lxml.
+    encoding: The charset given in the HTTP Content-Type header, if any. Without it, lxml detects the encoding
+    from the page itself, as it cannot see the header.
+    """
+    parser = None
+    if encoding:
+        try:
+            parser = lxml_html.HTMLParser(encoding=encoding)
+        except LookupError: # Unknown charset in the header, so let lxml detect it instead
+            pass
+    return lxml_html.fromstring(content, parser=parser)
+
+
+def get_structured_data_paragraphs(head_html, num_paragraphs, encoding=None):
+    """
+    Looks for the article text in the JSON-LD structured data ('articleBody') in a page's <head>.
+    Returns the first N substantial paragraphs of it, or an empty list if there are not that many.
+    Article text sent as a single line is skipped, since it cannot be split into paragraphs.
+    head_html: The bytes of the page up to its closing </head> tag.
+    encoding: The charset given in the HTTP Content-Type header, if any.
+    """
+    try:
+        head = parse_html(head_html, encoding)
+    except Exception: # e.g., an empty document
+        return []
+
+    for script_text in FIND_JSON_LD(head):
+        try:
+            data = json_loads(script_text)
+        except ValueError: # Malformed JSON-LD, try the next block
+            continue
+
+        # A block holds a single object, a list of objects, or an object with an '@graph' list of objects
+        if isinstance(data, dict):
+            data = data.get('@graph', [data])
+        for entry in data if isinstance(data, list) else []:
+            article_body = entry.get('articleBody') if isinstance(entry, dict) else None
+            if not isinstance(article_body, str):
+                continue
+            lines = article_body.strip().splitlines()
+            if len(lines) < 2:
+                continue # Not split into paragraphs, so fall back to the page body
+            paragraphs = [" ".join(line.split()) for line in lines]
+            paragraphs = [
+                text if len(text) <= STRUCTURED_DATA_PARAGRAPH_MAX_CHARS
+                else text[:STRUCTURED_DATA_PARAGRAPH_MAX_CHARS + 1].rsplit(' ', 1)[0]
+                for text in paragraphs if len(text) > 100
+            ][:num_paragraphs]
+            if num_paragraphs > 0 and len(paragraphs) == num_paragraphs:
+                return paragraphs
+    return []
+
+
+def get_article_preview(session, article_url, num_paragraphs=2):
+    """
+    Fetches the content of an article URL and extracts the first N substantial paragraphs,
+    from the page's structured data if it includes the article text, otherwise from the page body.
     Returns the concatenated paragraphs or an empty string if not found/error.
+    Previews found in the article preview cache are returned without fetching the article.
+    session: The HTTP session used to download the article.
     num_paragraphs: The desired number of paragraphs to extract.
     """
-    if DEBUG:
-        print(f"DEBUG: Fetching article preview from: {article_url}", file=sys.stdout)
-    try:
-        response = requests.get(article_url, timeout=5) # Shorter timeout for article fetch
-        response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.text, 'html.parser')
+    cached_preview = get_cached_preview(article_url, num_paragraphs)
+    if cached_preview is not None:
+        log.debug("Using cached article preview for: %s", article_url)
+        return cached_preview
 
+    log.debug("Fetching article preview from: %s", article_url)
+    try:
         paragraphs_content = []
 
-        # List of potential selectors for main article content containers, ordered by commonality/specificity
-        content_selectors = [
-            {'name': 'div', 'attrs': {'class': 'sdc-article-body'}}, # Common for BBC and some Sky
-            {'name': 'div', 'attrs': {'class': 'story-body__inner'}}, # Older BBC
-            {'name': 'div', 'attrs': {'class': 'article__content'}},  # Often used by Sky News
-            {'name': 'div', 'attrs': {'class': 'article-body'}},      # Generic but common
-            {'name': 'article'}, # HTML5 semantic tag for main article content
-            {'name': 'main'},    # HTML5 semantic tag for main content of the <body>
-        ]
-
-        target_container = None
-        for selector in content_selectors:
-            # Attempt to find the container using its tag name and attributes
-            if 'attrs' in selector:
-                target_container = soup.find(selector['name'], **selector['attrs'])
-            else:
-                target_container = soup.find(selector['name'])
-            
-            if target_container:
-                # If a suitable container is found, break and use this one
-                break 
-        
-        # Determine where to search for paragraphs
-        if target_container:
-            # If a specific container was found, search within it
-            all_p_tags = target_container.find_all('p')
-        else:
-            # Fallback: if no specific container is found, search all paragraphs on the page
-            # This is less ideal as it might pick up irrelevant text.
-            all_p_tags = soup.find_all('p')
-
-        for p_tag in all_p_tags:
-            text = p_tag.get_text(strip=True)
-            # Filter out very short paragraphs (e.g., image captions, single words, navigation)
-            # A heuristic of > 100 characters helps ensure meaningful content.
-            # Also, avoid paragraphs found within common non-article elements like headers or footers.
-            if text and len(text) > 100 and not p_tag.find_parent('header') and not p_tag.find_parent('footer') and not p_tag.find_parent('nav'):
-                paragraphs_content.append(text)
-                if len(paragraphs_content) >= num_paragraphs:
-                    break # Stop once we have enough substantial paragraphs
-
-        return "\n\n".join(paragraphs_content[:num_paragraphs]) if paragraphs_content else "" # Return only the first N found
+        # Stream the page and stop reading once ARTICLE_PREVIEW_MAX_BYTES have arrived.
+        # As soon as the whole <head> has arrived, check its structured data for the article text;
+        # if it is there, the rest of the page is never downloaded or parsed.
+        with session.get(article_url, timeout=5, stream=True) as response: # Shorter timeout for article fetch
+            response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
+            # Use the charset from the Content-Type header if it gives one (response.encoding falls back to
+            # ISO-8859-1 for any text/* type, so only trust it when the header actually names a charset)
+            encoding = response.encoding if 'charset=' in response.headers.get('Content-Type', '').lower() else None
+            content = bytearray()
+            head_end = -1
+            for chunk in response.iter_content(chunk_size=8192):
+                # Only search the newly arrived bytes (plus enough overlap to catch a tag split across chunks)
+                search_from = max(0, len(content) - len(b'</head>'))
+                content.extend(chunk)
+                if head_end == -1:
+                    head_end = content.find(b'</head>', search_from)
+                    if head_end != -1:
+                        paragraphs_content = get_structured_data_paragraphs(bytes(content[:head_end]), num_paragraphs, encoding)
+                        if paragraphs_content:
+                            log.debug("Using structured data preview for: %s", article_url)
+                            break
+                if len(content) >= ARTICLE_PREVIEW_MAX_BYTES:
+                    break
+
+        if not content:
+            return "" # An empty page has no preview; lxml would reject it as an empty document
+
+        if not paragraphs_content:
+            # Parse the raw bytes with lxml rather than decoding to text first.
+            # lxml copes with the page being cut off part way through.
+            tree = parse_html(bytes(content[:ARTICLE_PREVIEW_MAX_BYTES]), encoding)
+
+            # Pick the candidate matching the highest-priority entry in CONTENT_CONTAINERS,
+            # taking the first one on the page if several match equally well.
+            target_container = None
+            best_priority = len(CONTENT_CONTAINERS)
+            for candidate in FIND_CONTENT_CONTAINERS(tree):
+                candidate_classes = (candidate.get('class') or '').split()
+                priority = next(
+                    index for index, (tag, css_class) in enumerate(CONTENT_CONTAINERS)
+                    if candidate.tag == tag and (css_class is None or css_class in candidate_classes)
+                )
+                if priority < best_priority:
+                    target_container, best_priority = candidate, priority
+                    if priority == 0:
+                        break # Nothing can beat the top-priority container
+
+            # Determine where to search for paragraphs.
+            # If a specific container was found, search within it; otherwise fall back to all paragraphs
+            # on the page, which is less ideal as it might pick up irrelevant text.
+            # Either way, only the first num_paragraphs substantial paragraphs are returned, so text is
+            # never extracted from paragraphs that would be thrown away.
+            search_root = target_container if target_container is not None else tree
+            for p_tag in FIND_ARTICLE_PARAGRAPHS(search_root, limit=num_paragraphs):
+                paragraphs_content.append(" ".join(p_tag.text_content().split())) # Collapse whitespace left over from the markup
+
+        if not paragraphs_content:
+            return ""
+        preview = "\n\n".join(paragraphs_content[:num_paragraphs]) # Return only the first N found
+        cache_preview(article_url, num_paragraphs, preview)
+        return preview
 
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching article content from {article_url}: {e}", file=sys.stderr)
+        sys.stderr.write(f"Error fetching article content from {article_url}: {e}\n")
         return ""
-    except Exception as e: # Catch any other parsing errors (e.g., BeautifulSoup issues)
-        print(f"Error parsing article content from {article_url}: {e}", file=sys.stderr)
+    except Exception as e: # Catch any other parsing errors (e.g., lxml issues such as an empty document)
+        sys.stderr.write(f"Error parsing article content from {article_url}: {e}\n")
         return ""
 
 
-def fetch_news(feed_url, source_name):
+def fetch_news(cfg, session, feed_url, source_name):
     """
     Fetches news directly from a given RSS feed URL and extracts news items.
     Parses XML response and optionally fetches article preview.
     """
-    if DEBUG:
-        print(f"DEBUG: Fetching RSS from: {feed_url}", file=sys.stdout)
+    log.debug("Fetching RSS from: %s", feed_url)
     news_items = []
     try:
-        response = requests.get(feed_url, timeout=10) # Add timeout for robustness
+        response = session.get(feed_url, timeout=10) # Add timeout for robustness
         response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
 
-        # Parse the XML content
-        root = ET.fromstring(response.content)
-
-        # RSS feeds typically have a <channel> element containing <item> elements
-        # Some might have <feed> for Atom, but common RSS uses <channel>
-        channel = root.find('channel')
-        if channel is None:
-            # Try to find feed for Atom feeds, if it's not a standard RSS channel
-            feed = root.find('{http://www.w3.org/2005/Atom}feed')
-            if feed is not None:
-                # Handle Atom feed structure if necessary, for now, assume RSS
-                if DEBUG:
-                    print(f"DEBUG: Found Atom feed structure for {source_name}. Parsing as RSS might be incomplete.", file=sys.stdout)
-                items_elements = feed.findall('{http://www.w3.org/2005/Atom}entry')
+        # Take top items (more than num_news_items to allow for deduplication)
+        # We fetch up to 2 * num_news_items from each source to increase chances of getting enough unique ones
+        # after deduplication, but the final limit is applied later.
+        fetch_limit_per_source = max(cfg.num_news_items, 10) * 2 # Ensure at least 10 or 2x the requested number per source
+
+        # Stream through the XML with lxml's C-backed parser, handling each RSS <item> or Atom <entry>
+        # as soon as it has been read, and stop once enough have been collected rather than
+        # building a tree of the whole feed.
+        for _, item_element in etree.iterparse(io.BytesIO(response.content), tag=('item', ATOM_ENTRY_TAG)):
+            # findtext goes straight to the text, or None if the element is missing
+            if item_element.tag == ATOM_ENTRY_TAG:
+                title = item_element.findtext('atom:title', namespaces=ATOM_NAMESPACES)
+                description = item_element.findtext('atom:summary', namespaces=ATOM_NAMESPACES)
+                link = item_element.xpath('string(atom:link/@href)', namespaces=ATOM_NAMESPACES)
             else:
-                print(f"Warning: No 'channel' or 'feed' element found in XML response from {source_name}.", file=sys.stderr)
-                return []
-        else:
-            items_elements = channel.findall('item')
-        
-        if not items_elements:
-            print(f"Warning: No 'item' elements found in response from {source_name}. URL: {feed_url}", file=sys.stderr)
+                title = item_element.findtext('title')
+                description = item_element.findtext('description')
+                link = item_element.findtext('link')
+            item_element.clear() # Free the item's children now that its text has been read
+
+            item_link = link.strip() if link else '#'
+
+            news_item = NewsItem(
+                title=title.strip() if title else 'No Title',
+                description=description.strip() if description else 'No Description',
+                link=item_link,
+                source=source_name
+            )
+            news_items.append(news_item)
+            if len(news_items) >= fetch_limit_per_source:
+                break
+
+        if not news_items:
+            sys.stderr.write(f"Warning: No 'item' elements found in response from {source_name}. URL: {feed_url}\n")
             return []
 
-        # Take top items (more than NUM_NEWS_ITEMS to allow for deduplication)
-        # We fetch up to 2 * NUM_NEWS_ITEMS from each source to increase chances of getting enough unique ones
-        # after deduplication, but the final limit is applied later.
-        fetch_limit_per_source = max(NUM_NEWS_ITEMS, 10) * 2 # Ensure at least 10 or 2x the requested number per source
-        for item_element in items_elements[:fetch_limit_per_source]:
-            title = item_element.find('title')
-            description = item_element.find('description')
-            link = item_element.find('link')
-            
-            item_link = link.text.strip() if link is not None and link.text else '#'
-
-            news_item = {
-                'title': title.text.strip() if title is not None and title.text else 'No Title',
-                'description': description.text.strip() if description is not None and description.text else 'No Description',
-                'link': item_link,
-                'source': source_name
-            }
-            
-            # Fetch full story preview if enabled
-            if SHOW_FULL_STORY_PREVIEW and item_link and item_link != '#':
-                news_item['full_story_preview'] = get_article_preview(item_link, num_paragraphs=SHOW_FULL_STORY_PARAGRAPHS)
-            else:
-                news_item['full_story_preview'] = "" # Ensure the key exists even if empty
+        # Fetch full story previews if enabled, all at once rather than one article after another
+        if cfg.show_full_story_preview:
+            items_needing_preview = [item for item in news_items if item.link and item.link != '#']
+            previews = PREVIEW_EXECUTOR.map(lambda item: get_article_preview(session, item.link, num_paragraphs=cfg.show_full_story_paragraphs), items_needing_preview)
+            for item, preview in zip(items_needing_preview, previews):
+                item.full_story_preview = preview
 
-            news_items.append(news_item)
         return news_items
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching news from {source_name} ({feed_url}): {e}", file=sys.stderr)
+        sys.stderr.write(f"Error fetching news from {source_name} ({feed_url}): {e}\n")
         return []
-    except ET.ParseError as e:
-        print(f"Error parsing XML from {source_name} ({feed_url}): {e}", file=sys.stderr)
+    except etree.XMLSyntaxError as e:
+        sys.stderr.write(f"Error parsing XML from {source_name} ({feed_url}): {e}\n")
         return []
     except Exception as e:
-        print(f"An unexpected error occurred while processing news from {source_name} ({feed_url}): {e}", file=sys.stderr)
+        sys.stderr.write(f"An unexpected error occurred while processing news from {source_name} ({feed_url}): {e}\n")
         return []
 
 
-def deduplicate_news(all_news):
+def deduplicate_news(all_news: Iterable[NewsItem], limit: int | None = None) -> list[NewsItem]:
     """
     Deduplicates news headlines based on title and description to avoid repetition.
+    all_news can be any iterable of news items; it is only read as far as needed.
+    Stops as soon as 'limit' unique items have been found, if a limit is given.
     """
+    if limit is not None and limit <= 0:
+        return [] # No items wanted, e.g. NUM_NEWS_ITEMS=0
     unique_news = []
     seen_identifiers = set() # Use a set to store unique identifiers
 
     for item in all_news:
-        # Create a unique identifier from a combination of title and description
-        identifier = (item['title'].lower().strip(), item['description'].lower().strip())
+        # Create a unique identifier by hashing a combination of title and description,
+        # so the set holds small integers rather than pairs of strings
+        identifier = hash(f"{item.title.lower().strip()}\x00{item.description.lower().strip()}")
         if identifier not in seen_identifiers:
             unique_news.append(item)
             seen_identifiers.add(identifier)
+            if limit is not None and len(unique_news) >= limit:
+                break # No need to look any further once we have enough
     return unique_news
 
-def fetch_weather(lat, lon, api_key):
+def fetch_weather(session, lat, lon, api_key):
     """
     Fetches daily weather forecast from OpenWeatherMap One Call API 3.0.
     """
     # OpenWeatherMap One Call API 3.0 URL
     weather_api_url = f"https://api.openweathermap.org/data/3.0/onecall?lat={lat}&lon={lon}&exclude=minutely,hourly,alerts&units=metric&appid={api_key}"
-    if DEBUG:
-        print(f"DEBUG: Fetching weather from: {weather_api_url}", file=sys.stdout)
+    log.debug("Fetching weather from: %s", weather_api_url)
     try:
-        response = requests.get(weather_api_url, timeout=10) # Add timeout
+        response = session.get(weather_api_url, timeout=10) # Add timeout
         response.raise_for_status() # Raise an HTTPError for bad responses
-        data = response.json()
+        data = json_loads(response.content) # Parse the bytes directly, skipping the decode to text
 
         if 'daily' not in data or not data['daily']:
-            print(f"Warning: 'daily' weather data not found for lat={lat}, lon={lon}. Data: {data}", file=sys.stderr)
+            sys.stderr.write(f"Warning: 'daily' weather data not found for lat={lat}, lon={lon}. Data: {data}\n")
             return None
 
         today = data['daily'][0] # Get today's forecast
@@ -269,67 +608,65 @@ def fetch_weather(lat, lon, api_key):
             'feels_like': today['feels_like']['day']
         }
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching weather: {e}", file=sys.stderr)
+        sys.stderr.write(f"Error fetching weather: {e}\n")
         return None
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON from weather API: {e}", file=sys.stderr)
+    except ValueError as e: # Invalid JSON, or (without orjson) a body that is not valid UTF-8
+        sys.stderr.write(f"Error decoding JSON from weather API: {e}\n")
         return None
     except KeyError as e:
-        print(f"Error parsing weather data (missing key: {e}): {data}", file=sys.stderr)
+        sys.stderr.write(f"Error parsing weather data (missing key: {e}): {data}\n")
         return None
 
-def fetch_random_fact():
+def fetch_random_fact(session):
     """
     Fetches a random fact from the Useless Facts API.
     Returns the fact text or None on error.
     """
     fact_api_url = "https://uselessfacts.jsph.pl/api/v2/facts/random"
-    if DEBUG:
-        print(f"DEBUG: Fetching random fact from: {fact_api_url}", file=sys.stdout)
+    log.debug("Fetching random fact from: %s", fact_api_url)
     try:
-        response = requests.get(fact_api_url, timeout=5)
+        response = session.get(fact_api_url, timeout=5)
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content) # Parse the bytes directly, skipping the decode to text
         if data and data.get('text'):
             return data['text']
         return None
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching random fact: {e}", file=sys.stderr)
+        sys.stderr.write(f"Error fetching random fact: {e}\n")
         return None
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON from fact API: {e}", file=sys.stderr)
+    except ValueError as e:
+        sys.stderr.write(f"Error decoding JSON from fact API: {e}\n")
         return None
     except Exception as e:
-        print(f"An unexpected error occurred while fetching/parsing random fact: {e}", file=sys.stderr)
+        sys.stderr.write(f"An unexpected error occurred while fetching/parsing random fact: {e}\n")
         return None
 
-def fetch_random_joke():
+def fetch_random_joke(session):
     """
     Fetches a random joke from JokeAPI.
     Returns the joke text or None on error.
     """
     # Using 'Any' category with blacklisted flags for appropriate content
     joke_api_url = "https://v2.jokeapi.dev/joke/Any?blacklistFlags=racist,sexist,explicit&type=single"
-    if DEBUG:
-        print(f"DEBUG: Fetching random joke from: {joke_api_url}", file=sys.stdout)
+    log.debug("Fetching random joke from: %s", joke_api_url)
     try:
-        response = requests.get(joke_api_url, timeout=5)
+        response = session.get(joke_api_url, timeout=5)
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content) # Parse the bytes directly, skipping the decode to text
         if data and data.get('joke'):
             return data['joke']
         return None
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching random joke: {e}", file=sys.stderr)
+        sys.stderr.write(f"Error fetching random joke: {e}\n")
         return None
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON from joke API: {e}", file=sys.stderr)
+    except ValueError as e:
+        sys.stderr.write(f"Error decoding JSON from joke API: {e}\n")
         return None
     except Exception as e:
-        print(f"An unexpected error occurred while fetching/parsing random joke: {e}", file=sys.stderr)
+        sys.stderr.write(f"An unexpected error occurred while fetching/parsing random joke: {e}\n")
         return None
 
-def fetch_on_this_day_event():
+def fetch_on_this_day_event(session):
     """
     Fetches a random "On this day in history" event for the current date.
     Uses byabbe.se API which sources from Wikipedia.
@@ -339,12 +676,11 @@ def fetch_on_this_day_event():
     month = today_date.month
     day = today_date.day
     onthisday_api_url = f"https://byabbe.se/on-this-day/{month}/{day}/events.json"
-    if DEBUG:
-        print(f"DEBUG: Fetching 'On this day' event from: {onthisday_api_url}", file=sys.stdout)
+    log.debug("Fetching 'On this day' event from: %s", onthisday_api_url)
     try:
-        response = requests.get(onthisday_api_url, timeout=5)
+        response = session.get(onthisday_api_url, timeout=5)
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content) # Parse the bytes directly, skipping the decode to text
         
         if data and data.get('events') and len(data['events']) > 0:
             # Pick a random event from the list to keep it varied
@@ -356,17 +692,17 @@ def fetch_on_this_day_event():
                 return f"{random_event.get('year')}: {random_event.get('description')}"
         return None
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching 'On this day' event: {e}", file=sys.stderr)
+        sys.stderr.write(f"Error fetching 'On this day' event: {e}\n")
         return None
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON from 'On this day' API: {e}", file=sys.stderr)
+    except ValueError as e:
+        sys.stderr.write(f"Error decoding JSON from 'On this day' API: {e}\n")
         return None
     except Exception as e:
-        print(f"An unexpected error occurred while fetching/parsing 'On this day' event: {e}", file=sys.stderr)
+        sys.stderr.write(f"An unexpected error occurred while fetching/parsing 'On this day' event: {e}\n")
         return None
 
 
-def get_time_based_greeting():
+def get_time_based_greeting() -> str:
     """Returns 'Good morning', 'Good afternoon', or 'Good evening' based on current time."""
     current_hour = datetime.now().hour
     if 5 <= current_hour < 12:
@@ -377,125 +713,102 @@ def get_time_based_greeting():
         return "Good evening"
 
 
-def format_briefing(weather_data, news_items, random_fact, random_joke, onthisday_event, location_name):
+def format_briefing(cfg: Config, weather_data: dict | None, news_items: list[NewsItem], random_fact: str | None, random_joke: str | None,
+                    onthisday_event: str | None, location_name: str) -> str:
     """
     Formats the weather, news, random fact, random joke, and 'On this day' data into a readable daily briefing string.
-    Applies conversational mode if CONVERSATIONAL_MODE is True.
+    Applies conversational mode if cfg.conversational_mode is True.
+    Each entry in briefing_parts is a whole block of lines; a block ending in a newline is followed by a blank line.
     """
     briefing_parts = []
     today_formatted = date.today().strftime('%A, %d %B %Y')
 
-    if CONVERSATIONAL_MODE:
-        briefing_parts.append(f"{get_time_based_greeting()}! This is your daily briefing for {today_formatted}.")
-        briefing_parts.append("") # Add a blank line for spacing
+    if cfg.conversational_mode:
+        briefing_parts.append(f"{get_time_based_greeting()}! This is your daily briefing for {today_formatted}.\n")
     else:
-        briefing_parts.append(f"# Daily Briefing - {today_formatted}")
-        briefing_parts.append("") # Add a blank line for spacing
+        briefing_parts.append(f"# Daily Briefing - {today_formatted}\n")
 
     # Weather Section
-    if CONVERSATIONAL_MODE:
-        briefing_parts.append(f"Here's the weather for {location_name}:")
+    if cfg.conversational_mode:
+        weather_heading = f"Here's the weather for {location_name}:"
     else:
-        briefing_parts.append(f"## Weather for {location_name}")
-    
+        weather_heading = f"## Weather for {location_name}"
+
     if weather_data:
-        briefing_parts.append(f"Today's forecast: {weather_data['description'].capitalize()}")
-        briefing_parts.append(f"The maximum temperature expected is {round(weather_data['max_temp'])}°C, with a minimum of {round(weather_data['min_temp'])}°C.")
-        briefing_parts.append(f"It will feel like {round(weather_data['feels_like'])}°C.")
-        briefing_parts.append("")
+        briefing_parts.append(
+            f"{weather_heading}\n"
+            f"Today's forecast: {weather_data['description'].capitalize()}\n"
+            f"The maximum temperature expected is {round(weather_data['max_temp'])}°C, with a minimum of {round(weather_data['min_temp'])}°C.\n"
+            f"It will feel like {round(weather_data['feels_like'])}°C.\n"
+        )
     else:
-        briefing_parts.append("Weather forecast currently unavailable.")
-        briefing_parts.append("")
+        briefing_parts.append(f"{weather_heading}\nWeather forecast currently unavailable.\n")
 
     # News Section
-    if CONVERSATIONAL_MODE:
-        briefing_parts.append(f"The top news headlines for you are:")
+    if cfg.conversational_mode:
+        briefing_parts.append("The top news headlines for you are:\n")
     else:
-        briefing_parts.append("## Top News Headlines")
-    briefing_parts.append("")
+        briefing_parts.append("## Top News Headlines\n")
 
     if news_items:
-        for i, item in enumerate(news_items):
-            if CONVERSATIONAL_MODE:
-                briefing_parts.append(f"Headline number {i + 1} from {item['source']}: {item['title']}.")
-                briefing_parts.append(f"Summary: {item['description']}.")
-                if SHOW_FULL_STORY_PREVIEW and item.get('full_story_preview'):
-                    briefing_parts.append(f"Here's a preview of the story:")
-                    briefing_parts.append(f"{item['full_story_preview']}")
-                    if SHOW_CONTINUE_LINK:
-                        briefing_parts.append(f"You can continue reading more at the link: {item['link']}")
-                briefing_parts.append("") # Add a blank line after each news item
+        for i, item in enumerate(news_items, start=1):
+            show_preview = cfg.show_full_story_preview and item.full_story_preview
+            if cfg.conversational_mode:
+                preview_text = ""
+                if show_preview:
+                    preview_text = f"Here's a preview of the story:\n{item.full_story_preview}\n"
+                    if cfg.show_continue_link:
+                        preview_text += f"You can continue reading more at the link: {item.link}\n"
+                briefing_parts.append(f"Headline number {i} from {item.source}: {item.title}.\nSummary: {item.description}.\n{preview_text}")
             else:
-                briefing_parts.append(f"### {i + 1}. {item['title']} ({item['source']})")
-                briefing_parts.append(f"{item['description']}")
-                if SHOW_FULL_STORY_PREVIEW and item.get('full_story_preview'):
-                    briefing_parts.append(f"{item['full_story_preview']}")
-                    if SHOW_CONTINUE_LINK:
-                        briefing_parts.append(f"[Continue reading at {item['link']}]")
-                briefing_parts.append("")
+                preview_text = ""
+                if show_preview:
+                    preview_text = f"{item.full_story_preview}\n"
+                    if cfg.show_continue_link:
+                        preview_text += f"[Continue reading at {item.link}]\n"
+                briefing_parts.append(f"### {i}. {item.title} ({item.source})\n{item.description}\n{preview_text}")
     else:
-        briefing_parts.append("No news headlines available.")
-        briefing_parts.append("")
+        briefing_parts.append("No news headlines available.\n")
 
     # Random Fact Section
-    if ENABLE_RANDOM_FACT:
-        if CONVERSATIONAL_MODE:
-            briefing_parts.append("Did you know this fact?")
-        else:
-            briefing_parts.append("## Fact of the Day")
-        if random_fact:
-            briefing_parts.append(random_fact)
-            briefing_parts.append("")
-        else:
-            briefing_parts.append("Fact of the day currently unavailable.")
-            briefing_parts.append("")
-    
+    if cfg.enable_random_fact:
+        fact_heading = "Did you know this fact?" if cfg.conversational_mode else "## Fact of the Day"
+        briefing_parts.append(f"{fact_heading}\n{random_fact or 'Fact of the day currently unavailable.'}\n")
+
     # Random Joke Section
-    if ENABLE_RANDOM_JOKE:
-        if CONVERSATIONAL_MODE:
-            briefing_parts.append("Here's a joke to start your day:")
-        else:
-            briefing_parts.append("## Joke of the Day")
-        if random_joke:
-            briefing_parts.append(random_joke)
-            briefing_parts.append("")
-        else:
-            briefing_parts.append("Joke of the day currently unavailable.")
-            briefing_parts.append("")
+    if cfg.enable_random_joke:
+        joke_heading = "Here's a joke to start your day:" if cfg.conversational_mode else "## Joke of the Day"
+        briefing_parts.append(f"{joke_heading}\n{random_joke or 'Joke of the day currently unavailable.'}\n")
 
     # On This Day Section
-    if ENABLE_ONTHISDAY:
-        if CONVERSATIONAL_MODE:
-            briefing_parts.append("And finally, on this day in history:")
-        else:
-            briefing_parts.append("## On This Day in History")
-        if onthisday_event:
-            briefing_parts.append(onthisday_event)
-            briefing_parts.append("")
-        else:
-            briefing_parts.append("On this day in history currently unavailable.")
-            briefing_parts.append("")
+    if cfg.enable_onthisday:
+        onthisday_heading = "And finally, on this day in history:" if cfg.conversational_mode else "## On This Day in History"
+        briefing_parts.append(f"{onthisday_heading}\n{onthisday_event or 'On this day in history currently unavailable.'}\n")
 
     return "\n".join(briefing_parts)
 
 # --- Main Execution ---
 if __name__ == "__main__":
+    # Read the configuration once, then set up debug logging and the shared HTTP session from it
+    cfg = Config.from_env()
+    log.setLevel(logging.DEBUG if cfg.debug else logging.WARNING)
+    session = create_session(cfg)
+
     selected_location = {} # Initialize selected_location dictionary
 
     # Check for custom location environment variables first
-    if CUSTOM_LOCATION_NAME and CUSTOM_LOCATION_LATITUDE and CUSTOM_LOCATION_LONGITUDE:
+    if cfg.custom_location_name and cfg.custom_location_latitude and cfg.custom_location_longitude:
         try:
-            selected_location['name'] = CUSTOM_LOCATION_NAME
-            selected_location['lat'] = float(CUSTOM_LOCATION_LATITUDE)
-            selected_location['lon'] = float(CUSTOM_LOCATION_LONGITUDE)
-            if DEBUG:
-                print(f"DEBUG: Using custom location from environment variables: {selected_location['name']} ({selected_location['lat']}, {selected_location['lon']})", file=sys.stdout)
+            selected_location['name'] = cfg.custom_location_name
+            selected_location['lat'] = float(cfg.custom_location_latitude)
+            selected_location['lon'] = float(cfg.custom_location_longitude)
+            log.debug("Using custom location from environment variables: %s (%s, %s)", selected_location['name'], selected_location['lat'], selected_location['lon'])
         except ValueError:
             print("Error: Invalid numeric values for LOCATION_LATITUDE or LOCATION_LONGITUDE environment variables.", file=sys.stderr)
             sys.exit(1)
     else:
         # Fallback to command-line argument if custom env vars are not fully set
-        if CUSTOM_LOCATION_NAME or CUSTOM_LOCATION_LATITUDE or CUSTOM_LOCATION_LONGITUDE:
+        if cfg.custom_location_name or cfg.custom_location_latitude or cfg.custom_location_longitude:
             print("Warning: Partial custom location environment variables set. Please set LOCATION_NAME, LOCATION_LATITUDE, and LOCATION_LONGITUDE together, or none of them.", file=sys.stderr)
 
         # Get location from first command line argument, default to 'halstead'
@@ -508,63 +821,66 @@ if __name__ == "__main__":
 
 
     # API Key Handling
-    owm_api_key = os.getenv('OPENWEATHERMAP_API_KEY', OPENWEATHERMAP_API_KEY_DEFAULT)
+    owm_api_key = cfg.openweathermap_api_key
     
     if owm_api_key == OPENWEATHERMAP_API_KEY_DEFAULT or not owm_api_key:
         print("Error: OpenWeatherMap API key is not set. Please set the OPENWEATHERMAP_API_KEY environment variable or replace the placeholder in the script.", file=sys.stderr)
         sys.exit(1)
     
-    if DEBUG:
+    if cfg.debug:
         print("--- DEBUG Configuration ---", file=sys.stdout)
-        print(f"DEBUG (env): {os.getenv('DEBUG')}, Script Value: {DEBUG}", file=sys.stdout)
-        print(f"NUM_NEWS_ITEMS (env): {os.getenv('NUM_NEWS_ITEMS')}, Script Value: {NUM_NEWS_ITEMS}", file=sys.stdout)
-        print(f"SHOW_FULL_STORY_PREVIEW (env): {os.getenv('SHOW_FULL_STORY_PREVIEW')}, Script Value: {SHOW_FULL_STORY_PREVIEW}", file=sys.stdout)
-        print(f"SHOW_FULL_STORY_PARAGRAPHS (env): {os.getenv('SHOW_FULL_STORY_PARAGRAPHS')}, Script Value: {SHOW_FULL_STORY_PARAGRAPHS}", file=sys.stdout)
-        print(f"SHOW_CONTINUE_LINK (env): {os.getenv('SHOW_CONTINUE_LINK')}, Script Value: {SHOW_CONTINUE_LINK}", file=sys.stdout)
-        print(f"CONVERSATIONAL_MODE (env): {os.getenv('CONVERSATIONAL_MODE')}, Script Value: {CONVERSATIONAL_MODE}", file=sys.stdout)
-        print(f"ENABLE_RANDOM_FACT (env): {os.getenv('ENABLE_RANDOM_FACT')}, Script Value: {ENABLE_RANDOM_FACT}", file=sys.stdout)
-        print(f"ENABLE_RANDOM_JOKE (env): {os.getenv('ENABLE_RANDOM_JOKE')}, Script Value: {ENABLE_RANDOM_JOKE}", file=sys.stdout)
-        print(f"ENABLE_ONTHISDAY (env): {os.getenv('ENABLE_ONTHISDAY')}, Script Value: {ENABLE_ONTHISDAY}", file=sys.stdout)
+        print(f"DEBUG (env): {os.getenv('DEBUG')}, Script Value: {cfg.debug}", file=sys.stdout)
+        print(f"NUM_NEWS_ITEMS (env): {os.getenv('NUM_NEWS_ITEMS')}, Script Value: {cfg.num_news_items}", file=sys.stdout)
+        print(f"SHOW_FULL_STORY_PREVIEW (env): {os.getenv('SHOW_FULL_STORY_PREVIEW')}, Script Value: {cfg.show_full_story_preview}", file=sys.stdout)
+        print(f"SHOW_FULL_STORY_PARAGRAPHS (env): {os.getenv('SHOW_FULL_STORY_PARAGRAPHS')}, Script Value: {cfg.show_full_story_paragraphs}", file=sys.stdout)
+        print(f"SHOW_CONTINUE_LINK (env): {os.getenv('SHOW_CONTINUE_LINK')}, Script Value: {cfg.show_continue_link}", file=sys.stdout)
+        print(f"CONVERSATIONAL_MODE (env): {os.getenv('CONVERSATIONAL_MODE')}, Script Value: {cfg.conversational_mode}", file=sys.stdout)
+        print(f"ENABLE_RANDOM_FACT (env): {os.getenv('ENABLE_RANDOM_FACT')}, Script Value: {cfg.enable_random_fact}", file=sys.stdout)
+        print(f"ENABLE_RANDOM_JOKE (env): {os.getenv('ENABLE_RANDOM_JOKE')}, Script Value: {cfg.enable_random_joke}", file=sys.stdout)
+        print(f"ENABLE_ONTHISDAY (env): {os.getenv('ENABLE_ONTHISDAY')}, Script Value: {cfg.enable_onthisday}", file=sys.stdout)
+        print(f"ENABLE_HTTP_CACHE (env): {os.getenv('ENABLE_HTTP_CACHE')}, Script Value: {cfg.enable_http_cache}, requests-cache installed: {requests_cache is not None}", file=sys.stdout)
+        print(f"HTTP_CACHE_FILE (env): {os.getenv('HTTP_CACHE_FILE')}, Script Value: {cfg.http_cache_file}", file=sys.stdout)
+        print(f"ENABLE_PREVIEW_CACHE (env): {os.getenv('ENABLE_PREVIEW_CACHE')}, Script Value: {cfg.enable_preview_cache}", file=sys.stdout)
+        print(f"PREVIEW_CACHE_FILE (env): {os.getenv('PREVIEW_CACHE_FILE')}, Script Value: {cfg.preview_cache_file}", file=sys.stdout)
         
         print(f"OPENWEATHERMAP_API_KEY (env): {'***SET***' if os.getenv('OPENWEATHERMAP_API_KEY') else 'NOT SET'}, Script Value set: {bool(owm_api_key) and owm_api_key != OPENWEATHERMAP_API_KEY_DEFAULT}", file=sys.stdout)
         # Custom location debug print
-        print(f"LOCATION_NAME (env): {CUSTOM_LOCATION_NAME}, LOCATION_LATITUDE (env): {CUSTOM_LOCATION_LATITUDE}, LOCATION_LONGITUDE (env): {CUSTOM_LOCATION_LONGITUDE}", file=sys.stdout)
+        print(f"LOCATION_NAME (env): {cfg.custom_location_name}, LOCATION_LATITUDE (env): {cfg.custom_location_latitude}, LOCATION_LONGITUDE (env): {cfg.custom_location_longitude}", file=sys.stdout)
         print("---------------------------", file=sys.stdout)
 
 
-    # Fetch all news concurrently
-    all_news_promises = [fetch_news(feed['url'], feed['source']) for feed in RSS_FEEDS]
-    
-    # Execute all news fetching requests
-    all_news_results = []
-    for promise in all_news_promises:
-        all_news_results.extend(promise)
+    # Open the article preview cache, if previews are shown and the cache is enabled
+    if cfg.show_full_story_preview and cfg.enable_preview_cache:
+        PREVIEW_CACHE = open_preview_cache(cfg.preview_cache_file)
 
-    flat_news = all_news_results
-    unique_news = deduplicate_news(flat_news)
-    
-    # --- Apply NUM_NEWS_ITEMS limit to the final unique news list ---
-    final_news_items = unique_news[:NUM_NEWS_ITEMS]
+    # Fetch all news feeds and the optional extras concurrently.
+    # Every fetch is network-bound, so running them side by side reduces the total wait
+    # to roughly that of the slowest request rather than the sum of all of them.
+    # There is one worker per feed plus one for each of the weather, fact, joke and 'On this day'
+    # fetches, so none of them has to wait for a free worker. The extras are submitted first so
+    # they start straight away; disabled extras are never submitted at all.
+    with ThreadPoolExecutor(max_workers=len(RSS_FEEDS) + 4) as executor:
+        weather_future = executor.submit(fetch_weather, session, selected_location['lat'], selected_location['lon'], owm_api_key)
+        random_fact_future = executor.submit(fetch_random_fact, session) if cfg.enable_random_fact else None
+        random_joke_future = executor.submit(fetch_random_joke, session) if cfg.enable_random_joke else None
+        onthisday_future = executor.submit(fetch_on_this_day_event, session) if cfg.enable_onthisday else None
+        news_futures = [executor.submit(fetch_news, cfg, session, feed['url'], feed['source']) for feed in RSS_FEEDS]
 
-    # Fetch weather
-    weather_data = fetch_weather(selected_location['lat'], selected_location['lon'], owm_api_key)
+        # --- Deduplicate, keeping only the first num_news_items unique news items ---
+        # News results are chained straight into deduplication in RSS_FEEDS order (not completion order)
+        # so the feed priority, and therefore which headlines make the cut, stays stable.
+        flat_news = itertools.chain.from_iterable(future.result() for future in news_futures)
+        final_news_items = deduplicate_news(flat_news, limit=cfg.num_news_items)
 
-    # Fetch random fact (conditionally)
-    random_fact = None
-    if ENABLE_RANDOM_FACT:
-        random_fact = fetch_random_fact()
-    
-    # Fetch random joke (conditionally)
-    random_joke = None
-    if ENABLE_RANDOM_JOKE:
-        random_joke = fetch_random_joke()
+        weather_data = weather_future.result()
+        random_fact = random_fact_future.result() if random_fact_future else None
+        random_joke = random_joke_future.result() if random_joke_future else None
+        onthisday_event = onthisday_future.result() if onthisday_future else None
 
-    # Fetch 'On this day' event (conditionally)
-    onthisday_event = None
-    if ENABLE_ONTHISDAY:
-        onthisday_event = fetch_on_this_day_event()
+    # Save the previews fetched during this run in one go
+    close_preview_cache()
 
 
     # Generate and print briefing
-    briefing_text = format_briefing(weather_data, final_news_items, random_fact, random_joke, onthisday_event, selected_location['name'])
+    briefing_text = format_briefing(cfg, weather_data, final_news_items, random_fact, random_joke, onthisday_event, selected_location['name'])
     print(briefing_text)